@@ -1,4 +1,7 @@
 
+-- Trigram matching for substring lookups on malicious URLs
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create tables for the QR Trust database
 CREATE TABLE verified_partners (
   id SERIAL PRIMARY KEY,
@@ -38,5 +41,18 @@ CREATE TABLE scan_history (
   user_action VARCHAR(50)
 );
 
+-- Cached OpenAI web check results (embedding column is added by the API when
+-- OPENAI_CACHE_SEMANTIC is enabled and pgvector is available)
+CREATE TABLE openai_url_cache (
+  normalized_url TEXT PRIMARY KEY,
+  safe BOOLEAN,
+  details TEXT NOT NULL,
+  raw_results TEXT,
+  host TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE INDEX idx_verified_normalized_url ON verified_partners(normalized_url);
 CREATE INDEX idx_malicious_normalized_url ON malicious_urls(normalized_url);
+CREATE INDEX openai_url_cache_host ON openai_url_cache(host);
+CREATE INDEX malicious_urls_nu_trgm ON malicious_urls USING GIN (normalized_url gin_trgm_ops);
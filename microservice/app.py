@@ -1,14 +1,10 @@
 from typing import Union
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from pydantic import BaseModel
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+import asyncpg
 
 load_dotenv()
 
@@ -18,14 +14,6 @@ class Item(BaseModel):
     isGood: bool
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST", "localhost")
@@ -34,65 +22,45 @@ DB_NAME = os.getenv("DB_NAME")
 
 # DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 DATABASE_URL = os.getenv("DB_URL")
-
-app = FastAPI()
-engine = create_engine(DATABASE_URL)
-Base = declarative_base()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# asyncpg doesn't understand SQLAlchemy driver suffixes like postgresql+psycopg2://
+if DATABASE_URL and DATABASE_URL.startswith("postgresql+"):
+    DATABASE_URL = "postgresql://" + DATABASE_URL.split("://", 1)[1]
 
 
-@app.on_event("startup")
-async def startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.pool = await asyncpg.create_pool(DATABASE_URL, min_size=5, max_size=30)
     # Initialize table on startup
-    with engine.begin() as conn:
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS urls (
-                url VARCHAR(100) PRIMARY KEY,
-                is_good BOOLEAN NOT NULL
-            )
-        """))
+    await app.state.pool.execute("""
+        CREATE TABLE IF NOT EXISTS urls (
+            url VARCHAR(100) PRIMARY KEY,
+            is_good BOOLEAN NOT NULL
+        )
+    """)
+    yield
+    await app.state.pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.post("/")
-def addUrl(item: Item):
-    # insert_query = text("""
-    # INSERT INTO urls
-    # VALUES (:url, :isGood)
-    #     """)
-    with engine.connect() as connection:
-        # connection.execute(
-        #     text("CREATE TABLE IF NOT EXISTS urls (url varchar(100), isGood BOOLEAN);")
-        # )
-
-        insert_query = text("""
-            INSERT INTO urls 
-            VALUES (:url, :isGood)
-        """)
-
-        obj = {"url": item.url, "isGood": item.isGood}
-        connection.execute(insert_query, obj)
-        connection.commit()
-        # print(result)
+async def addUrl(item: Item):
+    await app.state.pool.execute("""
+        INSERT INTO urls (url, is_good)
+        VALUES ($1, $2)
+        ON CONFLICT (url) DO UPDATE SET is_good = EXCLUDED.is_good
+    """, item.url, item.isGood)
     return "Success"
 
 
 @app.get("/verify/{url}")
-def verify(url: str):
-    with engine.connect() as connection:
-        result = connection.execute(
-            text('SELECT * FROM urls WHERE url = :url'), {"url": url})
-        row = result.fetchone()
-        length = len(row)
-        if length == 0:
-            return {"isGood": False}
-        if row:
-            is_good = row[1]
-            if is_good:
-                return {"isGood": True}
-            else:
-                return {"isGood": False}
-        print(len(result))
-    return {"isGood": False}
+async def verify(url: str):
+    is_good = await app.state.pool.fetchval(
+        "SELECT is_good FROM urls WHERE url = $1", url
+    )
+    # fetchval() returns None for unknown URLs
+    return {"isGood": bool(is_good)}
 
 
 # @app.get("/items/{item_id}")